@@ -0,0 +1,114 @@
+import asyncio
+import collections
+import time
+from prometheus_client import Counter, Gauge
+
+# --- METRICS (exposed on /metrics by the Prometheus instrumentator) ---
+QUEUE_DEPTH = Gauge("predict_queue_depth", "Requests waiting for an inference slot.")
+IN_FLIGHT = Gauge("predict_in_flight", "Requests currently running inference.")
+SHED_TOTAL = Counter("predict_shed_total", "Requests rejected before inference.", ["reason"])
+
+
+class QueueFullError(Exception):
+    """Raised when the wait queue is full and the request is shed immediately."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request cannot finish before its deadline."""
+
+
+class AdmissionController:
+    """
+    Limits concurrent inferences and bounds the number of waiting requests.
+    Runs on the event loop, so no locking is needed (one instance per worker).
+    """
+
+    def __init__(self, max_concurrency, max_queue, queue_timeout, latency_half_life=10.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_half_life = latency_half_life
+        self.active = 0
+        self.avg_latency = 0.0
+        self._observed_at = time.monotonic()
+        self._waiters = collections.deque()
+
+    @property
+    def queue_depth(self):
+        return len(self._waiters)
+
+    def shed(self, reason):
+        SHED_TOTAL.labels(reason=reason).inc()
+
+    async def acquire(self, deadline=None):
+        """
+        Waits for an inference slot until `deadline` (monotonic time) or the queue timeout.
+        """
+        if self.active < self.max_concurrency and not self._waiters:
+            self._take()
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed("queue_full")
+            raise QueueFullError()
+
+        timeout, reason = self.queue_timeout, "queue_timeout"
+        if deadline is not None and deadline - time.monotonic() < timeout:
+            timeout, reason = deadline - time.monotonic(), "deadline"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        QUEUE_DEPTH.set(self.queue_depth)
+        try:
+            await asyncio.wait_for(waiter, timeout=max(timeout, 0))
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up: pass it on
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.shed(reason)
+                raise DeadlineExceededError() from None
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            QUEUE_DEPTH.set(self.queue_depth)
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                QUEUE_DEPTH.set(self.queue_depth)
+                return
+        self.active -= 1
+        IN_FLIGHT.set(self.active)
+
+    def check_deadline(self, deadline):
+        """
+        Drops the request if the remaining budget is shorter than a typical inference.
+        """
+        if deadline is not None and deadline - time.monotonic() < self.expected_latency():
+            self.shed("deadline")
+            raise DeadlineExceededError()
+
+    def expected_latency(self):
+        """
+        Inference latency estimate, capped at the queue timeout and halved every
+        `latency_half_life` seconds without a new observation. Without the decay a
+        single slow outlier could shed every request, and so never be corrected.
+        """
+        idle = time.monotonic() - self._observed_at
+        return min(self.avg_latency, self.queue_timeout) * 0.5 ** (idle / self.latency_half_life)
+
+    def observe(self, latency):
+        # Exponential moving average of inference latency (seconds)
+        if self.avg_latency:
+            latency = 0.9 * self.expected_latency() + 0.1 * latency
+        self.avg_latency = latency
+        self._observed_at = time.monotonic()
+
+    def _take(self):
+        self.active += 1
+        IN_FLIGHT.set(self.active)
@@ -1,17 +1,37 @@
 import pandas as pd
 import mlflow.sklearn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 from src.config import config
-import redis
+from src.admission import AdmissionController, DeadlineExceededError, QueueFullError
+from src.profiler import SamplingProfiler, awaiting
+import asyncio
+import hmac
+import redis.asyncio as redis
 import json
+import math
 import os
+import threading
+import time
 from prometheus_fastapi_instrumentator import Instrumentator # <--- NEW IMPORTS
 
 ml_models = {}
 redis_client = None
 
+# Admission control for /predict (limits are per worker process)
+admission = AdmissionController(
+    max_concurrency=config.PREDICT_MAX_CONCURRENCY,
+    max_queue=config.PREDICT_MAX_QUEUE,
+    queue_timeout=config.PREDICT_QUEUE_TIMEOUT,
+    latency_half_life=config.PREDICT_LATENCY_HALF_LIFE,
+)
+
+# Only one profile may run at a time
+profile_lock = threading.Lock()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,7 +40,7 @@ async def lifespan(app: FastAPI):
     try:
         redis_host = os.getenv("REDIS_HOST", "localhost")
         redis_client = redis.Redis(host=redis_host, port=6379, db=0, decode_responses=True)
-        redis_client.ping()
+        await redis_client.ping()
         print(f"✅ Redis Connection Established on {redis_host}!")
     except Exception as e:
         print(f"⚠️ Redis Connection Failed: {e}. Caching will be disabled.")
@@ -44,6 +64,8 @@ async def lifespan(app: FastAPI):
 
     # Closing transactions
     ml_models.clear()
+    if redis_client:
+        await redis_client.aclose()
     print("🧹 The memory has been cleared.")
 
 
@@ -83,35 +105,49 @@ def home():
 
 
 @app.get("/health")
-def health_check():
-    redis_status = "active" if redis_client and redis_client.ping() else "inactive"
+async def health_check():
+    redis_status = "active" if redis_client and await redis_client.ping() else "inactive"
     return {
         "status": "active",
         "model_loaded": "model" in ml_models,
-        "redis_cache": redis_status
+        "redis_cache": redis_status,
+        "in_flight": admission.active,
+        "queue_depth": admission.queue_depth
     }
 
 
-@app.post("/predict")
-def predict(data: CustomerData):
-    if "model" not in ml_models:
-        raise HTTPException(status_code=503, detail="The model is out of service.")
-
+def get_deadline(request: Request):
+    """
+    Reads the client time budget (X-Request-Timeout, seconds) as a monotonic deadline.
+    """
+    timeout = request.headers.get("X-Request-Timeout")
+    if timeout is None:
+        return None
+    try:
+        timeout = float(timeout)
+    except ValueError:
+        timeout = math.nan
+    if not math.isfinite(timeout):
+        raise HTTPException(status_code=400, detail="X-Request-Timeout must be a number of seconds.")
+    return time.monotonic() + timeout
+
+
+def overloaded(status_code, detail):
+    """
+    Fast rejection telling the client when to try again.
+    """
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(config.PREDICT_RETRY_AFTER)}
+    )
+
+
+def run_model(data: CustomerData):
+    """
+    Runs inference. Blocking: called in the thread pool.
+    """
     try:
-        # --- CACHING LOGIC BEGINS ---
-
-        # 1. Generate a unique key.
-        cache_key = f"prediction:{data.model_dump_json()}"
-
-        # 2. Check Redis (If Redis is running)
-        if redis_client:
-            cached_result = redis_client.get(cache_key)
-            if cached_result:
-                print("⚡ CACHE HIT: The result is coming back from Redis!")
-                return json.loads(cached_result)
-
-        # 3. Cache Miss (Run Model)
-        print("🐢 CACHE MISS: Running model...")
         input_df = pd.DataFrame([data.model_dump()])
 
         prediction = ml_models["model"].predict(input_df)
@@ -127,19 +163,121 @@ def predict(data: CustomerData):
             "source": "model"
         }
 
-        # 4. Save Result to Redis (TTL: 1 Hour)
-        if redis_client:
-            cache_data = response_data.copy()
-            cache_data["source"] = "cache"
-
-            redis_client.setex(cache_key, 3600, json.dumps(cache_data))
-
         return response_data
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+@app.post("/predict")
+async def predict(data: CustomerData, request: Request):
+    if "model" not in ml_models:
+        raise HTTPException(status_code=503, detail="The model is out of service.")
+
+    deadline = get_deadline(request)
+
+    # --- CACHING LOGIC BEGINS ---
+
+    # 1. Generate a unique key.
+    cache_key = f"prediction:{data.model_dump_json()}"
+
+    # 2. Check Redis (If Redis is running). Cache hits skip admission control,
+    # so they keep being served while the model is shedding load. The async client
+    # keeps the lookup out of the thread pool used for inference.
+    if redis_client:
+        try:
+            with awaiting("redis.get"):
+                cached_result = await redis_client.get(cache_key)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        if cached_result:
+            print("⚡ CACHE HIT: The result is coming back from Redis!")
+            return json.loads(cached_result)
+
+    # 3. Cache Miss: wait for an inference slot (bounded queue)
+    try:
+        admission.check_deadline(deadline)
+        await admission.acquire(deadline)
+    except QueueFullError:
+        raise overloaded(429, "Too many pending predictions, try again later.")
+    except DeadlineExceededError:
+        raise overloaded(503, "The prediction could not be started in time.")
+
+    # 4. Run Model (dropped if the deadline can no longer be met)
+    try:
+        admission.check_deadline(deadline)
+
+        print("🐢 CACHE MISS: Running model...")
+        started = time.monotonic()
+        response_data = await run_in_threadpool(run_model, data)
+        admission.observe(time.monotonic() - started)
+    except DeadlineExceededError:
+        raise overloaded(503, "The prediction could not be started in time.")
+    finally:
+        admission.release()
+
+    # 5. Save Result to Redis (TTL: 1 Hour)
+    if redis_client:
+        cache_data = response_data.copy()
+        cache_data["source"] = "cache"
+
+        try:
+            with awaiting("redis.setex"):
+                await redis_client.setex(cache_key, 3600, json.dumps(cache_data))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+    return response_data
+
+
+@app.get("/admin/profile")
+async def profile(
+    request: Request,
+    seconds: float = 10,
+    interval_ms: float = 10,
+    output_format: str = Query("collapsed", alias="format"),
+):
+    """
+    Samples every busy thread of the running API for `seconds` and returns a flamegraph:
+    'collapsed' stacks (text) or 'speedscope' JSON. Opt-in via PROFILING_ENABLED,
+    and always protected by PROFILING_TOKEN (X-Admin-Token header).
+    """
+    if not config.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
+    if not config.PROFILING_TOKEN:
+        raise HTTPException(status_code=403, detail="Profiling requires PROFILING_TOKEN to be set.")
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode(), config.PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+    if not 0 < seconds <= config.PROFILING_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {config.PROFILING_MAX_SECONDS:g}].")
+    if not (math.isfinite(interval_ms) and 1 <= interval_ms <= 1000):
+        raise HTTPException(status_code=400, detail="interval_ms must be in [1, 1000].")
+    if output_format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'speedscope'.")
+
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running.")
+
+    try:
+        print(f"🔬 Profiling for {seconds:g}s (every {interval_ms:g} ms)...")
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        profiler.start()
+        try:
+            # The event loop keeps serving requests while the profiler samples
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+    finally:
+        profile_lock.release()
+
+    # Share of the window spent sampling, so every profile reports its own cost
+    headers = {"X-Profiler-Overhead": f"{profiler.overhead:.4f}"}
+    if output_format == "speedscope":
+        return JSONResponse(profiler.speedscope(), headers=headers)
+    return PlainTextResponse(profiler.collapsed(), headers=headers)
+
+
 if __name__ == "__main__":
     import uvicorn
     # Env variable ile host settings
@@ -12,9 +12,24 @@ class Config:
     DATA_RAW_PATH = PROJ_ROOT / "data" / "raw" / "WA_FN-UseC_-Telco-Customer-Churn.csv"
     DATA_PROCESSED_PATH = PROJ_ROOT / "data" / "processed" / "churn_data_processed.csv"
 
+    # Rows per chunk when streaming the raw export (see src/data_loader.py)
+    DATA_CHUNK_SIZE = int(os.getenv("DATA_CHUNK_SIZE", "100000"))
+
     # MLflow Settings
     MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
 
+    # Admission control for /predict (per worker process)
+    PREDICT_MAX_CONCURRENCY = int(os.getenv("PREDICT_MAX_CONCURRENCY", "4"))  # parallel inferences
+    PREDICT_MAX_QUEUE = int(os.getenv("PREDICT_MAX_QUEUE", "32"))  # requests waiting for a slot
+    PREDICT_QUEUE_TIMEOUT = float(os.getenv("PREDICT_QUEUE_TIMEOUT", "2.0"))  # max wait (seconds)
+    PREDICT_RETRY_AFTER = int(os.getenv("PREDICT_RETRY_AFTER", "1"))  # Retry-After header (seconds)
+    PREDICT_LATENCY_HALF_LIFE = float(os.getenv("PREDICT_LATENCY_HALF_LIFE", "10.0"))  # latency estimate decay (seconds)
+
+    # On-demand profiling (/admin/profile), disabled by default
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")  # required: checked against X-Admin-Token
+    PROFILING_MAX_SECONDS = float(os.getenv("PROFILING_MAX_SECONDS", "60"))
+
     # Model Registry Name
     MODEL_NAME = "TelcoCustomerChurn"
 
@@ -1,8 +1,14 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from src.config import config
 import os
 
+# Share of every churn class that goes to the Simulation (unseen) split
+TEST_SIZE = 0.20
+# Resolution of the hash buckets used to assign rows to a split
+HASH_BUCKETS = 10_000
+# Split keys are read as text so every chunk hashes them the same way
+RAW_DTYPES = {'customerID': str, 'Churn': str}
+
 
 def load_dataset(path):
     """
@@ -11,11 +17,24 @@ def load_dataset(path):
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
 
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, dtype=RAW_DTYPES)
     print(f"✅ Data loaded. Size: {df.shape}")
     return df
 
 
+def iter_dataset(path, chunksize=None):
+    """
+    Streams CSV file in chunks of `chunksize` rows.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    chunksize = chunksize or config.DATA_CHUNK_SIZE
+    with pd.read_csv(path, dtype=RAW_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+
 def clean_column_names(df):
     """
     Standardizes column names (Lower Case & Snake Case).
@@ -26,25 +45,52 @@ def clean_column_names(df):
     return df
 
 
+def clean_raw_data(df):
+    """
+    Applies the raw-data fixes: column names and 'totalcharges' coercion.
+    Charges are forced to float so every chunk is written the same way.
+    """
+    df = clean_column_names(df)
+
+    df['totalcharges'] = pd.to_numeric(df['totalcharges'], errors='coerce')
+    df['totalcharges'] = df['totalcharges'].fillna(0).astype(float)
+    df['monthlycharges'] = df['monthlycharges'].astype(float)
+    return df
+
+
 def handle_imbalanced_data(df):
 
     return df
 
 
-def split_and_save(df):
+def unseen_mask(df, test_size=TEST_SIZE):
     """
-    It separates and saves the data into Training (80%) and Simulation (20%).
+    Returns a boolean mask marking the rows of the Simulation (unseen) split.
+    Each row is placed by hashing its churn class and 'customerid', so the
+    split is stratified, deterministic and independent of the other rows.
     """
+    keys = df['churn'].astype(str) + ':' + df['customerid'].astype(str)
+    buckets = pd.util.hash_pandas_object(keys, index=False) % HASH_BUCKETS
+    return (buckets < int(test_size * HASH_BUCKETS)).to_numpy()
 
-    train_df, unseen_df = train_test_split(df, test_size=0.20, random_state=42, stratify=df['churn'])
 
+def _output_paths():
     # Create folder if it doesn't exist
     output_dir = config.PROJ_ROOT / "data" / "processed"
     os.makedirs(output_dir, exist_ok=True)
 
+    return output_dir / "churn_train.csv", output_dir / "churn_unseen.csv"
+
+
+def split_and_save(df):
+    """
+    It separates and saves the data into Training (80%) and Simulation (20%).
+    """
+    mask = unseen_mask(df)
+    train_df, unseen_df = df[~mask], df[mask]
+
     # Save files
-    train_path = output_dir / "churn_train.csv"
-    unseen_path = output_dir / "churn_unseen.csv"
+    train_path, unseen_path = _output_paths()
 
     train_df.to_csv(train_path, index=False)
     unseen_df.to_csv(unseen_path, index=False)
@@ -54,11 +100,49 @@ def split_and_save(df):
     print(f"   📂 Unseen Data: {unseen_df.shape} -> {unseen_path} (Save that for live simulation!)")
 
 
-if __name__ == "__main__":
-    df = load_dataset(config.DATA_RAW_PATH)
-    df = clean_column_names(df)
+def split_and_save_chunked(path, chunksize=None):
+    """
+    Out-of-core version of 'split_and_save' for raw exports that don't fit in RAM.
+    Cleans and splits the raw file chunk by chunk; memory is bounded by `chunksize`.
+    Produces the same files as the in-memory path.
+    Chunks go to temporary files that replace the previous split only on success.
+    """
+    train_path, unseen_path = _output_paths()
+    tmp_train_path = train_path.with_name(train_path.name + ".tmp")
+    tmp_unseen_path = unseen_path.with_name(unseen_path.name + ".tmp")
+    train_rows, unseen_rows = 0, 0
+    header = True
+
+    try:
+        try:
+            for chunk in iter_dataset(path, chunksize):
+                chunk = clean_raw_data(chunk)
+                mask = unseen_mask(chunk)
+
+                mode = 'w' if header else 'a'
+                chunk[~mask].to_csv(tmp_train_path, mode=mode, header=header, index=False)
+                chunk[mask].to_csv(tmp_unseen_path, mode=mode, header=header, index=False)
+
+                train_rows += int((~mask).sum())
+                unseen_rows += int(mask.sum())
+                header = False
+        except pd.errors.EmptyDataError:
+            raise ValueError(f"File is empty: {path}") from None
+
+        if train_rows + unseen_rows == 0:
+            raise ValueError(f"File has no data rows: {path}")
+
+        os.replace(tmp_train_path, train_path)
+        os.replace(tmp_unseen_path, unseen_path)
+    finally:
+        for tmp_path in (tmp_train_path, tmp_unseen_path):
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    print(f"✅ Data was parsed and recorded in chunks:")
+    print(f"   📂 Train Data: {train_rows} rows -> {train_path}")
+    print(f"   📂 Unseen Data: {unseen_rows} rows -> {unseen_path} (Save that for live simulation!)")
 
-    df['totalcharges'] = pd.to_numeric(df['totalcharges'], errors='coerce')
-    df['totalcharges'] = df['totalcharges'].fillna(0)
 
-    split_and_save(df)
\ No newline at end of file
+if __name__ == "__main__":
+    split_and_save_chunked(config.DATA_RAW_PATH)
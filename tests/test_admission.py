@@ -0,0 +1,124 @@
+import asyncio
+import time
+import pytest
+from prometheus_client import REGISTRY
+from src.admission import AdmissionController, DeadlineExceededError, QueueFullError
+
+
+def test_admission_limits_concurrency_and_queue():
+    """
+    Test that extra requests wait in the queue, overflow is rejected,
+    and a released slot is handed to the oldest waiter.
+    """
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+
+        # 1. First request takes the only slot
+        await controller.acquire()
+        assert controller.active == 1
+
+        # 2. Second request waits in the queue
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        # 3. Third request finds the queue full
+        with pytest.raises(QueueFullError):
+            await controller.acquire()
+
+        # 4. Releasing the slot wakes the waiter
+        controller.release()
+        await waiter
+        assert controller.active == 1
+        assert controller.queue_depth == 0
+
+        controller.release()
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_queue_timeout():
+    """
+    Test that a request waiting longer than the queue timeout is dropped and leaves the queue.
+    """
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.01)
+        await controller.acquire()
+
+        with pytest.raises(DeadlineExceededError):
+            await controller.acquire()
+
+        assert controller.queue_depth == 0
+        assert controller.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_admission_deadline_uses_observed_latency():
+    """
+    Test that a request is dropped when its remaining budget is shorter than a typical inference.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=30)
+    controller.observe(10.0)
+
+    with pytest.raises(DeadlineExceededError):
+        controller.check_deadline(time.monotonic() + 1.0)
+
+    controller.check_deadline(None)
+    controller.check_deadline(time.monotonic() + 60.0)
+
+
+def test_admission_latency_estimate_recovers_from_outlier():
+    """
+    Test that a slow outlier cannot shed requests forever: the estimate is capped
+    at the queue timeout and decays while nothing is observed.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5, latency_half_life=0.05)
+    controller.observe(60.0)
+    assert controller.expected_latency() <= 5
+
+    # 1. Right after the outlier a 1 second budget is shed
+    with pytest.raises(DeadlineExceededError):
+        controller.check_deadline(time.monotonic() + 1.0)
+
+    # 2. Without new observations the estimate decays and requests get through again
+    time.sleep(0.5)
+    controller.check_deadline(time.monotonic() + 1.0)
+
+
+def test_admission_latency_estimate_is_capped():
+    """
+    Test that the estimate never exceeds the queue timeout.
+    """
+    controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=0.5)
+    controller.observe(60.0)
+
+    controller.check_deadline(time.monotonic() + 1.0)
+
+
+def test_admission_shed_reason():
+    """
+    Test that a wait cut short by the client deadline is counted as 'deadline',
+    and one cut short by the queue timeout as 'queue_timeout'.
+    """
+    def shed_count(reason):
+        return REGISTRY.get_sample_value("predict_shed_total", {"reason": reason}) or 0
+
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+        await controller.acquire()
+
+        deadline_before, timeout_before = shed_count("deadline"), shed_count("queue_timeout")
+
+        with pytest.raises(DeadlineExceededError):
+            await controller.acquire(deadline=time.monotonic() + 0.01)
+        assert shed_count("deadline") == deadline_before + 1
+        assert shed_count("queue_timeout") == timeout_before
+
+        with pytest.raises(DeadlineExceededError):
+            await controller.acquire(deadline=time.monotonic() + 60)
+        assert shed_count("deadline") == deadline_before + 1
+        assert shed_count("queue_timeout") == timeout_before + 1
+
+    asyncio.run(scenario())
@@ -1,9 +1,31 @@
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from src.app import app, ml_models
 
 client = TestClient(app)
 
+PAYLOAD = {
+    "gender": "Female",
+    "senior_citizen": 0,
+    "partner": "Yes",
+    "dependents": "No",
+    "tenure_months": 12,
+    "phoneservice": "No",
+    "multiplelines": "No phone service",
+    "internetservice": "DSL",
+    "onlinesecurity": "No",
+    "onlinebackup": "Yes",
+    "deviceprotection": "No",
+    "techsupport": "No",
+    "streamingtv": "No",
+    "streamingmovies": "No",
+    "contract": "Month-to-month",
+    "paperlessbilling": "Yes",
+    "paymentmethod": "Electronic check",
+    "monthlycharges": 29.85,
+    "totalcharges": 29.85
+}
+
 
 def test_health_check():
     """
@@ -32,34 +54,11 @@ def test_prediction_endpoint():
     # 2. INJECT FAKE MODEL INTO APPLICATION
     ml_models["model"] = fake_model
 
-    # 3. Test Data
-    payload = {
-        "gender": "Female",
-        "senior_citizen": 0,
-        "partner": "Yes",
-        "dependents": "No",
-        "tenure_months": 12,
-        "phoneservice": "No",
-        "multiplelines": "No phone service",
-        "internetservice": "DSL",
-        "onlinesecurity": "No",
-        "onlinebackup": "Yes",
-        "deviceprotection": "No",
-        "techsupport": "No",
-        "streamingtv": "No",
-        "streamingmovies": "No",
-        "contract": "Month-to-month",
-        "paperlessbilling": "Yes",
-        "paymentmethod": "Electronic check",
-        "monthlycharges": 29.85,
-        "totalcharges": 29.85
-    }
-
-    # 4. Post Request
+    # 3. Post Request
     try:
-        response = client.post("/predict", json=payload)
+        response = client.post("/predict", json=PAYLOAD)
 
-        # 5. Kontroller
+        # 4. Kontroller
         assert response.status_code == 200, f"Error Detail: {response.text}"
 
         data = response.json()
@@ -68,4 +67,102 @@ def test_prediction_endpoint():
         assert data["churn_status"] == "Yes"
 
     finally:
-        ml_models.clear()
\ No newline at end of file
+        ml_models.clear()
+
+
+def test_prediction_shed_when_queue_full(monkeypatch):
+    """
+    Test that /predict answers 429 with Retry-After when no slot and no queue room is left,
+    without ever calling the model.
+    """
+    from src.app import admission
+
+    fake_model = MagicMock()
+    ml_models["model"] = fake_model
+    monkeypatch.setattr(admission, "max_concurrency", 0)
+    monkeypatch.setattr(admission, "max_queue", 0)
+
+    try:
+        response = client.post("/predict", json=PAYLOAD)
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        fake_model.predict.assert_not_called()
+
+    finally:
+        ml_models.clear()
+
+
+def test_prediction_dropped_after_deadline():
+    """
+    Test that a request whose client deadline has already passed is dropped before inference.
+    """
+    fake_model = MagicMock()
+    ml_models["model"] = fake_model
+
+    try:
+        response = client.post("/predict", json=PAYLOAD, headers={"X-Request-Timeout": "0"})
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+        fake_model.predict.assert_not_called()
+
+        for timeout in ["soon", "nan", "inf", "1e400"]:
+            response = client.post("/predict", json=PAYLOAD, headers={"X-Request-Timeout": timeout})
+            assert response.status_code == 400, timeout
+        fake_model.predict.assert_not_called()
+
+    finally:
+        ml_models.clear()
+
+
+def test_cache_hit_served_while_shedding(monkeypatch):
+    """
+    Test that cached predictions are still returned when the model queue is full.
+    """
+    from src import app as app_module
+
+    fake_redis = AsyncMock()
+    fake_redis.get.return_value = '{"prediction": 0, "churn_status": "No", "churn_probability": 0.1, "source": "cache"}'
+
+    ml_models["model"] = MagicMock()
+    monkeypatch.setattr(app_module, "redis_client", fake_redis)
+    monkeypatch.setattr(app_module.admission, "max_concurrency", 0)
+    monkeypatch.setattr(app_module.admission, "max_queue", 0)
+
+    try:
+        response = client.post("/predict", json=PAYLOAD)
+
+        assert response.status_code == 200
+        assert response.json()["source"] == "cache"
+
+    finally:
+        ml_models.clear()
+
+
+def test_cache_miss_uses_async_redis(monkeypatch):
+    """
+    Test that a cache miss runs the model and stores the result through the async Redis client.
+    """
+    from src import app as app_module
+
+    fake_redis = AsyncMock()
+    fake_redis.get.return_value = None
+
+    fake_model = MagicMock()
+    fake_model.predict.return_value = [0]
+    fake_model.predict_proba.return_value = [[0.9, 0.1]]
+
+    ml_models["model"] = fake_model
+    monkeypatch.setattr(app_module, "redis_client", fake_redis)
+
+    try:
+        response = client.post("/predict", json=PAYLOAD)
+
+        assert response.status_code == 200
+        assert response.json()["source"] == "model"
+        fake_redis.get.assert_awaited_once()
+        fake_redis.setex.assert_awaited_once()
+
+    finally:
+        ml_models.clear()
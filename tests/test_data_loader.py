@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+from src import data_loader
+from src.config import config
+from src.data_loader import clean_raw_data, split_and_save, split_and_save_chunked, unseen_mask
+
+
+def make_raw_data(n_rows=200):
+    """
+    Builds a small raw export with the original (un-cleaned) column names.
+    """
+    return pd.DataFrame({
+        'customerID': [f"{i:04d}-ABCDE" for i in range(n_rows)],
+        'gender': ['Male', 'Female'] * (n_rows // 2),
+        'SeniorCitizen': [0, 1] * (n_rows // 2),
+        'tenure': list(range(n_rows)),
+        'MonthlyCharges': [20.0 + (i % 7) for i in range(n_rows)],
+        'TotalCharges': [' ' if i % 50 == 0 else str(i * 10) for i in range(n_rows)],
+        'Churn': ['Yes' if i % 4 == 0 else 'No' for i in range(n_rows)],
+    })
+
+
+def test_chunked_split_matches_in_memory(tmp_path, monkeypatch):
+    """
+    Test that the out-of-core pipeline writes exactly the same files
+    as the in-memory one, whatever the chunk size.
+    """
+    raw_path = tmp_path / "raw.csv"
+    make_raw_data().to_csv(raw_path, index=False)
+    monkeypatch.setattr(config, "PROJ_ROOT", tmp_path)
+    processed = tmp_path / "data" / "processed"
+
+    # 1. In-memory reference
+    split_and_save(clean_raw_data(data_loader.load_dataset(raw_path)))
+    expected_train = (processed / "churn_train.csv").read_text()
+    expected_unseen = (processed / "churn_unseen.csv").read_text()
+
+    # 2. Chunked runs (including chunks smaller than a class)
+    for chunksize in [1, 7, 64, 1000]:
+        split_and_save_chunked(raw_path, chunksize=chunksize)
+        assert (processed / "churn_train.csv").read_text() == expected_train
+        assert (processed / "churn_unseen.csv").read_text() == expected_unseen
+
+
+def test_unseen_mask_is_stratified_and_deterministic():
+    """
+    Test that every churn class is split roughly 80/20 and that
+    the assignment only depends on the row itself.
+    """
+    df = clean_raw_data(make_raw_data(4000))
+    mask = unseen_mask(df)
+
+    for _, group_mask in pd.Series(mask).groupby(df['churn'].to_numpy()):
+        assert abs(group_mask.mean() - 0.20) < 0.05
+
+    # Shuffling rows must not change which split a customer lands in
+    shuffled = df.sample(frac=1, random_state=0)
+    assert (unseen_mask(shuffled) == mask[shuffled.index]).all()
+
+
+def test_chunked_split_matches_in_memory_with_numeric_ids(tmp_path, monkeypatch):
+    """
+    Test that numeric customer IDs (with one missing) land in the same split
+    whether a chunk contains the missing value or not.
+    """
+    raw = make_raw_data()
+    raw['customerID'] = [str(i) for i in range(len(raw))]
+    raw.loc[5, 'customerID'] = ''
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+    monkeypatch.setattr(config, "PROJ_ROOT", tmp_path)
+    processed = tmp_path / "data" / "processed"
+
+    split_and_save(clean_raw_data(data_loader.load_dataset(raw_path)))
+    expected_train = (processed / "churn_train.csv").read_text()
+    expected_unseen = (processed / "churn_unseen.csv").read_text()
+
+    for chunksize in [1, 7, 64]:
+        split_and_save_chunked(raw_path, chunksize=chunksize)
+        assert (processed / "churn_train.csv").read_text() == expected_train
+        assert (processed / "churn_unseen.csv").read_text() == expected_unseen
+
+
+@pytest.mark.parametrize("content", ["", ",".join(make_raw_data(2).columns) + "\n"])
+def test_chunked_split_rejects_empty_input(tmp_path, monkeypatch, content):
+    """
+    Test that an empty or header-only export raises and keeps the previous split intact.
+    """
+    monkeypatch.setattr(config, "PROJ_ROOT", tmp_path)
+    processed = tmp_path / "data" / "processed"
+    processed.mkdir(parents=True)
+    (processed / "churn_train.csv").write_text("previous train")
+    (processed / "churn_unseen.csv").write_text("previous unseen")
+
+    raw_path = tmp_path / "raw.csv"
+    raw_path.write_text(content)
+
+    with pytest.raises(ValueError):
+        split_and_save_chunked(raw_path, chunksize=10)
+
+    assert (processed / "churn_train.csv").read_text() == "previous train"
+    assert (processed / "churn_unseen.csv").read_text() == "previous unseen"
+    assert sorted(p.name for p in processed.iterdir()) == ["churn_train.csv", "churn_unseen.csv"]
+
+
+def test_chunked_split_failure_keeps_previous_split(tmp_path, monkeypatch):
+    """
+    Test that a failure partway through the file leaves the previous split untouched.
+    """
+    raw = make_raw_data()
+    raw['MonthlyCharges'] = raw['MonthlyCharges'].astype(object)
+    raw.loc[150, 'MonthlyCharges'] = 'not a number'
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+    monkeypatch.setattr(config, "PROJ_ROOT", tmp_path)
+    processed = tmp_path / "data" / "processed"
+    processed.mkdir(parents=True)
+    (processed / "churn_train.csv").write_text("previous train")
+    (processed / "churn_unseen.csv").write_text("previous unseen")
+
+    with pytest.raises(ValueError):
+        split_and_save_chunked(raw_path, chunksize=50)
+
+    assert (processed / "churn_train.csv").read_text() == "previous train"
+    assert (processed / "churn_unseen.csv").read_text() == "previous unseen"
+    assert sorted(p.name for p in processed.iterdir()) == ["churn_train.csv", "churn_unseen.csv"]
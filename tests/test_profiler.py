@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from fastapi.testclient import TestClient
+from src.app import app
+from src.config import config
+from src.profiler import SamplingProfiler, awaiting
+
+client = TestClient(app)
+
+
+def busy_work(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_profiler_collects_collapsed_stacks():
+    """
+    Test that the sampler sees other threads and renders flamegraph-compatible output.
+    """
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy-worker")
+    worker.start()
+
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.samples > 0
+
+    # 'root;frame;frame count', root is the thread name
+    lines = profiler.collapsed().splitlines()
+    assert any(line.startswith("busy-worker;") and "busy_work (" in line for line in lines)
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert "sampling-profiler" not in stack
+
+    # Speedscope frames are shared between samples and weighted in seconds
+    profile = profiler.speedscope()
+    sampled = profile["profiles"][0]
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"])
+    n_frames = len(profile["shared"]["frames"])
+    assert all(0 <= i < n_frames for sample in sampled["samples"] for i in sample)
+
+
+def test_profiler_skips_idle_threads():
+    """
+    Test that idle pool threads are not sampled and the sampler keeps its own cost low.
+    """
+    release = threading.Event()
+    idle = [threading.Thread(target=release.wait, name=f"idle-{i}") for i in range(40)]
+    for thread in idle:
+        thread.start()
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy-worker")
+    worker.start()
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    time.sleep(0.5)
+    profiler.stop()
+    stop.set()
+    release.set()
+    for thread in idle + [worker]:
+        thread.join()
+
+    roots = {stack[0] for stack in profiler.stacks}
+    assert "busy-worker" in roots
+    assert not any(root.startswith("idle-") for root in roots)
+    assert 0 < profiler.overhead < 0.05
+
+
+def test_profiler_samples_pending_awaits():
+    """
+    Test that an event loop waiting on a marked call (e.g. a slow Redis) is sampled,
+    while the same loop waiting on nothing is skipped as idle.
+    """
+    async def slow_call(name):
+        if name:
+            with awaiting(name):
+                await asyncio.sleep(0.3)
+        else:
+            await asyncio.sleep(0.3)
+
+    def profile_loop(name):
+        loop_thread = threading.Thread(target=asyncio.run, args=(slow_call(name),), name="event-loop")
+        profiler = SamplingProfiler()
+        profiler.start()
+        loop_thread.start()
+        loop_thread.join()
+        profiler.stop()
+        return profiler.collapsed()
+
+    stacks = profile_loop("redis.get")
+    assert any(line.startswith("event-loop;") and "select (" in line and "[awaiting redis.get]" in line
+               for line in stacks.splitlines())
+
+    assert "[awaiting" not in profile_loop(None)
+
+
+def test_profile_endpoint_disabled_by_default():
+    """
+    Test that /admin/profile is unavailable unless PROFILING_ENABLED is set.
+    """
+    response = client.get("/admin/profile", params={"seconds": 0.05})
+    assert response.status_code == 404
+
+
+def test_profile_endpoint(monkeypatch):
+    """
+    Test the /admin/profile endpoint with token check and both output formats.
+    """
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILING_TOKEN", "secret")
+
+    response = client.get("/admin/profile", params={"seconds": 0.05})
+    assert response.status_code == 403
+
+    response = client.get("/admin/profile", params={"seconds": 0.05}, headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+
+    headers = {"X-Admin-Token": "secret"}
+
+    # Idle threads are skipped, so keep one busy while profiling
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        response = client.get("/admin/profile", params={"seconds": 0.1}, headers=headers)
+        assert response.status_code == 200
+        assert "busy-worker;" in response.text
+        assert 0 <= float(response.headers["X-Profiler-Overhead"]) < 1
+
+        response = client.get("/admin/profile", params={"seconds": 0.1, "format": "speedscope"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["profiles"][0]["type"] == "sampled"
+    finally:
+        stop.set()
+        worker.join()
+
+    response = client.get("/admin/profile", params={"seconds": 3600}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.get("/admin/profile", params={"seconds": 0.05, "format": "svg"}, headers=headers)
+    assert response.status_code == 400
+
+    # Non-finite or out-of-range intervals would busy-loop or kill the sampler thread
+    for interval_ms in ["nan", "inf", "-inf", "0.5", "5000"]:
+        response = client.get("/admin/profile", params={"seconds": 0.05, "interval_ms": interval_ms}, headers=headers)
+        assert response.status_code == 400, interval_ms
+
+    for seconds in ["nan", "inf"]:
+        response = client.get("/admin/profile", params={"seconds": seconds}, headers=headers)
+        assert response.status_code == 400, seconds
+
+
+def test_profile_endpoint_requires_token(monkeypatch):
+    """
+    Test that enabling profiling without a configured token does not open the endpoint.
+    """
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILING_TOKEN", None)
+
+    response = client.get("/admin/profile", params={"seconds": 0.05})
+    assert response.status_code == 403
+
+    response = client.get("/admin/profile", params={"seconds": 0.05}, headers={"X-Admin-Token": ""})
+    assert response.status_code == 403